@@ -0,0 +1,254 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from converter import convert, output_paths, metadata_path, ENCODERS, DEFAULT_PNG_PROFILE, PNG_PROFILES
+from reverse_converter import reverse_converter, check_metadata
+
+FORWARD_NAMES = ('displace.bin',)
+REVERSE_NAMES = ('displace.raw', 'displace.png')
+FORWARD_EXTENSIONS = tuple(os.path.splitext(name)[1] for name in FORWARD_NAMES)
+REVERSE_EXTENSIONS = tuple(os.path.splitext(name)[1] for name in REVERSE_NAMES)
+
+def parse_formats(value):
+    formats = [fmt.strip().lower() for fmt in value.split(',') if fmt.strip()]
+    unknown = [fmt for fmt in formats if fmt not in ENCODERS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unsupported format {', '.join(unknown) or value!r}; choose from {', '.join(sorted(ENCODERS))}")
+    return list(dict.fromkeys(formats))
+
+def map_input_kind(path):
+    name = os.path.basename(path).lower()
+    if name in FORWARD_NAMES:
+        return 'forward'
+    if name in REVERSE_NAMES:
+        return 'reverse'
+    return None
+
+def collect_inputs(paths, kind):
+    extensions = FORWARD_EXTENSIONS if kind == 'forward' else REVERSE_EXTENSIONS
+    inputs = []
+    seen = set()
+
+    for path in paths:
+        if os.path.isdir(path):
+            candidates = []
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                candidates.extend(os.path.join(root, name) for name in sorted(files)
+                                  if map_input_kind(name) == kind)
+        else:
+            candidates = [path] if path.lower().endswith(extensions) else []
+
+        for candidate in candidates:
+            key = os.path.normcase(os.path.abspath(candidate))
+            if key not in seen:
+                seen.add(key)
+                inputs.append(candidate)
+
+    return inputs
+
+def find_metadata_conflicts(inputs):
+    owners = {}
+    conflicts = []
+
+    for path in inputs:
+        json_path = os.path.normcase(os.path.abspath(metadata_path(path)))
+        if json_path in owners:
+            conflicts.append((owners[json_path], path))
+        else:
+            owners[json_path] = path
+
+    return conflicts
+
+def select_reverse_inputs(inputs):
+    selected = {}
+    skipped = []
+
+    for path in inputs:
+        key = os.path.normcase(os.path.abspath(os.path.splitext(path)[0]))
+        current = selected.get(key)
+        if current is None:
+            selected[key] = path
+            continue
+
+        newer, older = (path, current) if os.path.getmtime(path) > os.path.getmtime(current) else (current, path)
+        selected[key] = newer
+        skipped.append({'input': older, 'status': 'skipped', 'error': f"{newer} is newer and writes the same .bin"})
+
+    return list(selected.values()), skipped
+
+def _forward_task(input_path, formats, size, profile, skip_unchanged):
+    base_path = os.path.splitext(input_path)[0]
+    outputs = output_paths(base_path, formats)
+
+    result = convert(input_path, outputs, size, True, options={'png': {'profile': profile, 'threads': 1}},
+                     skip_unchanged=skip_unchanged)
+
+    return {
+        'status': 'unchanged' if result.skipped else 'ok',
+        'outputs': list(result.outputs.values()),
+        'min': result.min,
+        'max': result.max,
+        'delta': result.delta,
+        'size': result.size,
+        'json_path': result.json_path,
+    }
+
+def _reverse_task(input_path, json_data):
+    output_path = os.path.splitext(input_path)[0] + ".bin"
+    reverse_converter(input_path, output_path, json_data)
+
+    return {'outputs': [output_path]}
+
+def _run_task(func, input_path, *args):
+    start = time.perf_counter()
+    try:
+        entry = {'input': input_path, 'status': 'ok'}
+        entry.update(func(input_path, *args))
+    except Exception as e:
+        entry = {'input': input_path, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+    entry['seconds'] = round(time.perf_counter() - start, 3)
+    return entry
+
+def load_metadata(json_path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        json_data = json.load(f)
+
+    return json_data, check_metadata(json_data)
+
+def pair_metadata(inputs, allow_version_mismatch=False):
+    tasks = []
+    problems = []
+
+    for path in inputs:
+        json_path = str(metadata_path(path))
+        if not os.path.isfile(json_path):
+            problems.append({'input': path, 'status': 'unpaired', 'metadata': json_path,
+                             'error': "metadata file not found"})
+            continue
+
+        try:
+            json_data, version_age = load_metadata(json_path)
+        except Exception as e:
+            problems.append({'input': path, 'status': 'invalid', 'metadata': json_path,
+                             'error': f"{type(e).__name__}: {e}"})
+            continue
+
+        if version_age != "current" and not allow_version_mismatch:
+            problems.append({'input': path, 'status': 'mismatched', 'metadata': json_path,
+                             'error': f"metadata written by {json_data['DGCVer']} ({version_age} version)"})
+            continue
+
+        tasks.append((_reverse_task, path, json_data))
+
+    return tasks, problems
+
+def default_workers(task_count):
+    return max(1, min(task_count, os.cpu_count() or 1))
+
+def run_batch(tasks, workers=None):
+    results = []
+    if not tasks:
+        return results
+
+    workers = workers or default_workers(len(tasks))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_task, *task) for task in tasks]
+        for future in as_completed(futures):
+            entry = future.result()
+            if entry['status'] == 'ok':
+                logging.info(f"Converted {entry['input']} in {entry['seconds']:.2f}s")
+            elif entry['status'] == 'unchanged':
+                logging.info(f"Skipped unchanged {entry['input']}")
+            else:
+                logging.error(f"Failed {entry['input']}: {entry['error']}")
+            results.append(entry)
+
+    order = {task[1]: index for index, task in enumerate(tasks)}
+    results.sort(key=lambda entry: order[entry['input']])
+    return results
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="DisplaceBox --batch", description="Headless batch conversion")
+    parser.add_argument('paths', nargs='+', help="input files or directories")
+    parser.add_argument('--reverse', '-reverse', action='store_true', help="convert .raw/.png back to .bin")
+    parser.add_argument('--format', type=parse_formats, default=['raw'],
+                        help=f"comma-separated output formats ({', '.join(sorted(ENCODERS))})")
+    parser.add_argument('--size', type=int, default=None, help="map side, detected from the .ssl file when omitted")
+    parser.add_argument('--profile', choices=list(PNG_PROFILES), default=DEFAULT_PNG_PROFILE)
+    parser.add_argument('--metadata', help="metadata .json used for every reverse conversion; "
+                        "by default each map is paired with its displace_{mapname}_metadata.json")
+    parser.add_argument('--allow-version-mismatch', action='store_true',
+                        help="convert maps whose metadata comes from another DisplaceBox version")
+    parser.add_argument('--force', action='store_true', help="reconvert maps even if their outputs are up to date")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--summary', help="write the JSON summary to this file instead of stdout")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    problems = []
+
+    if args.reverse:
+        inputs, skipped = select_reverse_inputs(collect_inputs(args.paths, 'reverse'))
+        if args.metadata:
+            try:
+                json_data, version_age = load_metadata(args.metadata)
+            except Exception as e:
+                logging.error(f"Invalid metadata {args.metadata}: {type(e).__name__}: {e}")
+                return 2
+            if version_age != "current" and not args.allow_version_mismatch:
+                logging.error(f"{args.metadata} was written by {json_data['DGCVer']} ({version_age} version)")
+                return 2
+            tasks = [(_reverse_task, path, json_data) for path in inputs]
+        else:
+            tasks, problems = pair_metadata(inputs, args.allow_version_mismatch)
+            for entry in problems:
+                logging.warning(f"Skipping {entry['input']}: {entry['error']}")
+    else:
+        formats = args.format
+        inputs = collect_inputs(args.paths, 'forward')
+        conflicts = find_metadata_conflicts(inputs)
+        if conflicts:
+            for first, second in conflicts:
+                logging.error(f"{first} and {second} would both write {metadata_path(first)}")
+            return 2
+        skipped = []
+        tasks = [(_forward_task, path, formats, args.size, args.profile, not args.force) for path in inputs]
+
+    workers = args.workers or default_workers(len(tasks))
+
+    start = time.perf_counter()
+    results = run_batch(tasks, workers) + problems + skipped
+
+    summary = {
+        'mode': 'reverse' if args.reverse else 'forward',
+        'workers': workers,
+        'seconds': round(time.perf_counter() - start, 3),
+        'succeeded': sum(1 for entry in results if entry['status'] == 'ok'),
+        'unchanged': sum(1 for entry in results if entry['status'] == 'unchanged'),
+        'skipped': len(skipped),
+        'unpaired': [entry['input'] for entry in problems if entry['status'] == 'unpaired'],
+        'mismatched': [entry['input'] for entry in problems if entry['status'] == 'mismatched'],
+        'invalid': [entry['input'] for entry in problems if entry['status'] == 'invalid'],
+        'failed': sum(1 for entry in results if entry['status'] == 'error'),
+        'results': results,
+    }
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        logging.info(f"Batch summary saved to: {args.summary}")
+    else:
+        json.dump(summary, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    return 1 if summary['failed'] else 0
@@ -0,0 +1,255 @@
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import gc
+
+from converter import (ENCODERS, PNG_PROFILES, PNG_BAND_BYTES, STREAMING_MIN_SIZE, np, open_heights, metadata_path,
+                       process_raw, process_png, _get_stats, _quantize)
+from reverse_converter import reverse_converter, STREAMING_MIN_BYTES
+from terrain import TERRAIN_KINDS, write_displace
+
+DEFAULT_SIZES = (256, 512, 1024)
+DEFAULT_TERRAIN = 'flat_regions'
+SUITE_SIZES = (64, 128, 256, 512, 1024, 2048, 4096)
+SUITE_OPERATIONS = ('process_raw', 'process_png', 'reverse_raw', 'reverse_png')
+REGRESSION_TOLERANCE = 0.15
+REGRESSION_MIN_SECONDS = 0.01
+DEFAULT_REPEAT = 3
+MEMORY_SIZES = (256, 1024, 2048, 4096)
+MB = 1024 * 1024
+MEMORY_BUDGETS = {
+    ('process_raw', False): (6, 4 * MB),
+    ('process_raw', True): (0, 8 * MB),
+    ('process_png', False): (6, 4 * MB),
+    ('process_png', True): (0, 8 * MB),
+    ('reverse_raw', False): (8, 8 * MB),
+    ('reverse_raw', True): (0, 16 * MB),
+    ('reverse_png', False): (6, 12 * MB),
+}
+
+def bench_png_profiles(sizes, workdir, kinds=TERRAIN_KINDS):
+    results = []
+
+    for kind, size in ((kind, size) for kind in kinds for size in sizes):
+        input_path = os.path.join(workdir, f"{kind}_{size}.bin")
+        write_displace(input_path, size, kind)
+
+        raw = open_heights(input_path, size)
+        stats = _get_stats(raw)
+        quantized = _quantize(raw, stats[0], stats[2])
+        del raw
+
+        for profile in PNG_PROFILES:
+            output_path = os.path.join(workdir, f"{kind}_{size}_{profile}.png")
+
+            start = time.perf_counter()
+            encoder = ENCODERS['png'](output_path, size, stats, profile=profile)
+            encoder.write(quantized)
+            encoder.close()
+            elapsed = time.perf_counter() - start
+
+            results.append({
+                'terrain': kind,
+                'size': size,
+                'profile': profile,
+                'seconds': elapsed,
+                'bytes': os.path.getsize(output_path),
+                'ratio': os.path.getsize(output_path) / (size ** 2 * 2),
+            })
+
+    return results
+
+def print_png_profiles(results):
+    print(f"{'terrain':<12}  {'size':>6}  {'profile':<10}  {'encode ms':>10}  {'bytes':>12}  {'ratio':>6}")
+    for row in results:
+        print(
+            f"{row['terrain']:<12}  {row['size']:>6}  {row['profile']:<10}  {row['seconds'] * 1000:>10.1f}  "
+            f"{row['bytes']:>12}  {row['ratio']:>6.3f}"
+        )
+
+def _run_operation(operation, map_dir, json_data):
+    input_path = os.path.join(map_dir, "displace.bin")
+    timings = {}
+
+    start = time.perf_counter()
+    if operation == 'process_raw':
+        process_raw(input_path, os.path.join(map_dir, "displace.raw"), timings=timings)
+    elif operation == 'process_png':
+        process_png(input_path, os.path.join(map_dir, "displace.png"), timings=timings)
+    else:
+        ext = operation.split('_', 1)[1]
+        reverse_converter(os.path.join(map_dir, f"displace.{ext}"), os.path.join(map_dir, f"reverse_{ext}.bin"),
+                          json_data, timings=timings)
+    seconds = time.perf_counter() - start
+
+    return seconds, timings
+
+def _prepare_map(workdir, size, kind):
+    map_dir = os.path.join(workdir, f"{kind}_{size}")
+    os.makedirs(map_dir, exist_ok=True)
+    write_displace(os.path.join(map_dir, "displace.bin"), size, kind)
+    return map_dir
+
+def _load_metadata(map_dir):
+    with open(metadata_path(os.path.join(map_dir, "displace.bin")), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def bench_suite(sizes, workdir, repeat=DEFAULT_REPEAT, kind=DEFAULT_TERRAIN):
+    results = []
+
+    for size in sizes:
+        map_dir = _prepare_map(workdir, size, kind)
+
+        json_data = None
+        for operation in SUITE_OPERATIONS:
+            runs = [_run_operation(operation, map_dir, json_data) for _ in range(repeat)]
+            seconds, timings = min(runs, key=lambda run: run[0])
+
+            if json_data is None:
+                json_data = _load_metadata(map_dir)
+
+            pixels = size ** 2
+            results.append({
+                'operation': operation,
+                'size': size,
+                'seconds': seconds,
+                'stages': timings,
+                'mb_per_s': pixels * 4 / 1e6 / seconds,
+                'mpixel_per_s': pixels / 1e6 / seconds,
+            })
+
+    return results
+
+def print_suite(results):
+    stages = ('read', 'stats', 'quantize', 'dequantize', 'encode', 'write')
+    print(f"{'operation':<12}  {'size':>5}  {'total ms':>9}  " + "  ".join(f"{stage:>10}" for stage in stages)
+          + f"  {'MB/s':>8}  {'Mpix/s':>8}")
+    for row in results:
+        stage_ms = "  ".join(f"{row['stages'].get(stage, 0.0) * 1000:>10.1f}" for stage in stages)
+        print(
+            f"{row['operation']:<12}  {row['size']:>5}  {row['seconds'] * 1000:>9.1f}  {stage_ms}  "
+            f"{row['mb_per_s']:>8.1f}  {row['mpixel_per_s']:>8.2f}"
+        )
+
+def memory_budget(operation, size):
+    if operation in ('process_raw', 'process_png'):
+        streaming = size >= STREAMING_MIN_SIZE
+    elif operation == 'reverse_raw':
+        streaming = size ** 2 * 2 >= STREAMING_MIN_BYTES
+    else:
+        streaming = False
+
+    per_pixel, fixed = MEMORY_BUDGETS[(operation, streaming)]
+    if operation == 'process_png':
+        fixed += 3 * PNG_BAND_BYTES * (os.cpu_count() or 1)
+
+    return per_pixel * size ** 2 + fixed
+
+def bench_memory(sizes, workdir, kind=DEFAULT_TERRAIN):
+    results = []
+
+    for size in sizes:
+        map_dir = _prepare_map(workdir, size, kind)
+
+        json_data = None
+        for operation in SUITE_OPERATIONS:
+            gc.collect()
+            tracemalloc.start()
+            try:
+                _run_operation(operation, map_dir, json_data)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+            if json_data is None:
+                json_data = _load_metadata(map_dir)
+
+            budget = memory_budget(operation, size)
+            results.append({
+                'operation': operation,
+                'size': size,
+                'peak_bytes': peak,
+                'bytes_per_pixel': peak / size ** 2,
+                'budget_bytes': budget,
+                'within_budget': peak <= budget,
+            })
+
+    return results
+
+def print_memory(results):
+    print(f"{'operation':<12}  {'size':>5}  {'peak MB':>9}  {'B/pixel':>8}  {'budget MB':>9}")
+    for row in results:
+        print(
+            f"{row['operation']:<12}  {row['size']:>5}  {row['peak_bytes'] / MB:>9.2f}  {row['bytes_per_pixel']:>8.2f}  "
+            f"{row['budget_bytes'] / MB:>9.2f}" + ("" if row['within_budget'] else "  OVER BUDGET")
+        )
+
+def compare_baseline(results, baseline, tolerance=REGRESSION_TOLERANCE):
+    previous = {(row['operation'], row['size']): row for row in baseline['results']}
+    regressions = []
+
+    for row in results:
+        base = previous.get((row['operation'], row['size']))
+        if base is None or base['seconds'] < REGRESSION_MIN_SECONDS:
+            continue
+        ratio = row['seconds'] / base['seconds']
+        row['baseline_ratio'] = ratio
+        if ratio > 1.0 + tolerance:
+            regressions.append(row)
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DisplaceBox conversion benchmarks")
+    parser.add_argument('--sizes', type=int, nargs='+', default=None)
+    parser.add_argument('--terrain', choices=TERRAIN_KINDS, default=DEFAULT_TERRAIN,
+                        help="synthetic terrain used for the timing and memory runs")
+    parser.add_argument('--png-profiles', action='store_true', help="compare PNG compression profiles instead")
+    parser.add_argument('--memory', action='store_true', help="check peak memory against the per-pixel budgets")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs per operation, the fastest is kept")
+    parser.add_argument('--output', help="write results to this JSON file")
+    parser.add_argument('--baseline', help="JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help="allowed slowdown against the baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory(prefix='displacebox_bench_') as workdir:
+        if args.png_profiles:
+            print_png_profiles(bench_png_profiles(args.sizes or list(DEFAULT_SIZES), workdir))
+            return 0
+
+        if args.memory:
+            results = bench_memory(args.sizes or list(MEMORY_SIZES), workdir, args.terrain)
+            print_memory(results)
+            if args.output:
+                with open(args.output, 'w', encoding='utf-8') as f:
+                    json.dump({'numpy': np is not None, 'terrain': args.terrain, 'results': results}, f, indent=2)
+            return 0 if all(row['within_budget'] for row in results) else 1
+
+        results = bench_suite(args.sizes or list(SUITE_SIZES), workdir, args.repeat, args.terrain)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_baseline(results, json.load(f), args.tolerance)
+
+    print_suite(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'numpy': np is not None, 'terrain': args.terrain, 'results': results}, f, indent=2)
+
+    for row in regressions:
+        print(f"REGRESSION {row['operation']} {row['size']}: {row['baseline_ratio']:.2f}x baseline", file=sys.stderr)
+
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
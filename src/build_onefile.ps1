@@ -1 +1 @@
-python -m nuitka --onefile main.py --include-module=localization --include-module=converter --include-module=reverse_converter --include-module=reverse_ui --include-module=ui --include-module=ui_components --include-module=lang_manager --include-module=resources --include-module=updater --include-module=config --include-module=src_assets --include-data-dir=src_assets=src_assets --windows-icon-from-ico=".\src_assets\icon.ico" --windows-company-name="stakan" --windows-product-name="DisplaceBox" --windows-file-version=2.2 --windows-file-description="HTA map displace.bin file to raw/png GUI converter" --windows-console-mode=disable --enable-plugin=tk-inter
+python -m nuitka --onefile main.py --include-module=localization --include-module=converter --include-module=reverse_converter --include-module=progress --include-module=batch --include-module=watch --include-module=reverse_ui --include-module=ui --include-module=ui_components --include-module=lang_manager --include-module=resources --include-module=updater --include-module=config --include-module=src_assets --include-data-dir=src_assets=src_assets --windows-icon-from-ico=".\src_assets\icon.ico" --windows-company-name="stakan" --windows-product-name="DisplaceBox" --windows-file-version=2.2 --windows-file-description="HTA map displace.bin file to raw/png GUI converter" --windows-console-mode=attach --enable-plugin=tk-inter
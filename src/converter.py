@@ -1,73 +1,623 @@
 import struct
-from PIL import Image
+import os
+import zlib
+import re
+import math
+import mmap
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
 import json
+import hashlib
 import logging
 from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 from config import DGCVER
+from progress import ConversionStage, ProgressReporter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CHUNK_ELEMENTS = 1 << 18
+STREAMING_MIN_SIZE = 2048
+LEVELSIZE_SCALE = 16
+
+PNG_PROFILES = {
+    'fast': {'compress_level': 1, 'strategy': zlib.Z_DEFAULT_STRATEGY, 'filter_type': 'up'},
+    'balanced': {'compress_level': 6, 'strategy': zlib.Z_DEFAULT_STRATEGY, 'filter_type': 'up'},
+    'archival': {'compress_level': 9, 'strategy': zlib.Z_DEFAULT_STRATEGY, 'filter_type': 'adaptive'},
+}
+DEFAULT_PNG_PROFILE = 'balanced'
+STATS_PROGRESS_SHARE = 0.2
+PNG_THREADS_MIN_SIZE = 1024
+PNG_BAND_BYTES = 1 << 20
+PNG_FILTERS = {'none': 0, 'sub': 1, 'up': 2, 'paeth': 4}
+PNG_ADAPTIVE_CANDIDATES = (('up', zlib.Z_DEFAULT_STRATEGY), ('paeth', zlib.Z_FILTERED))
+HASH_CHUNK_BYTES = 1 << 20
+RUNTIME_OPTIONS = ('threads',)
+
+class MapSizeError(Exception):
+    pass
+
+def find_ssl(input_path):
+    map_dir = Path(input_path).parent
+
+    preferred = map_dir / f"{map_dir.name}.ssl"
+    if preferred.is_file():
+        return preferred
+
+    candidates = sorted(map_dir.glob('*.ssl'))
+    return candidates[0] if len(candidates) == 1 else None
+
+def read_levelsize(ssl_path):
+    with open(ssl_path, 'r', encoding='utf-8', errors='ignore') as f:
+        match = re.search(r'levelsize\W{0,4}(\d+)', f.read(), re.IGNORECASE)
+
+    return int(match.group(1)) if match else None
+
+def detect_size(input_path):
+    file_size = os.path.getsize(input_path)
+    side = math.isqrt(file_size // 4)
+
+    if file_size == 0 or side * side * 4 != file_size:
+        raise MapSizeError(f"{input_path} is not a square float32 heightfield ({file_size} bytes)")
+
+    ssl_path = find_ssl(input_path)
+    if ssl_path is not None:
+        levelsize = read_levelsize(ssl_path)
+        if levelsize is not None and levelsize * LEVELSIZE_SCALE != side:
+            raise MapSizeError(
+                f"{input_path} is {side}x{side}, but {ssl_path.name} declares levelsize {levelsize} "
+                f"({levelsize * LEVELSIZE_SCALE}x{levelsize * LEVELSIZE_SCALE})"
+            )
+
+    logging.info(f"Detected map size: {side}x{side}")
+
+    return side
+
+def _check_size(input_path, size):
+    file_size = os.path.getsize(input_path)
+
+    if file_size != size * size * 4:
+        raise MapSizeError(f"{input_path} is {file_size} bytes, expected {size * size * 4} bytes for {size}x{size}")
+
+def open_heights(input_path, size):
+    _check_size(input_path, size)
+
+    if np is not None:
+        return np.memmap(input_path, dtype='<f4', mode='r')
 
-def process_raw(input_path, output_path, size, save_metadata=True):
     with open(input_path, 'rb') as stream:
-        raw = struct.unpack(f'{size ** 2}f', stream.read())
+        mapped = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return memoryview(mapped).cast('f')
+
+def iter_height_rows(input_path, size, chunk_elements=CHUNK_ELEMENTS):
+    _check_size(input_path, size)
+
+    rows = max(1, chunk_elements // size)
+    buffer = bytearray(rows * size * 4)
+
+    with open(input_path, 'rb', buffering=0) as stream:
+        while True:
+            read = stream.readinto(buffer)
+            if not read:
+                break
+
+            view = memoryview(buffer)[:read]
+            yield np.frombuffer(view, dtype='<f4') if np is not None else view.cast('f')
+
+def _iter_row_blocks(raw, size, chunk_elements=CHUNK_ELEMENTS):
+    step = max(1, chunk_elements // size) * size
+
+    for start in range(0, len(raw), step):
+        yield raw[start:start + step]
+
+def scan_stats(input_path, size, reporter=None, progress_share=1.0, digest=None):
+    _min = _max = None
+    done = 0
+
+    for block in iter_height_rows(input_path, size):
+        if digest is not None:
+            digest.update(block)
+        block_min, block_max, _ = _get_stats(block)
+        _min = block_min if _min is None else min(_min, block_min)
+        _max = block_max if _max is None else max(_max, block_max)
+
+        done += len(block)
+        if reporter is not None:
+            reporter.report(ConversionStage.STATS, done / size ** 2 * progress_share)
+
+    return _min, _max, _max - _min
+
+def _get_stats(raw):
+    if np is not None:
+        _min = float(raw.min())
+        _max = float(raw.max())
+    else:
+        _min = min(raw)
+        _max = max(raw)
 
-    _min = min(raw)
-    _max = max(raw)
-    _del = _max - _min
+    return _min, _max, _max - _min
+
+def _quantize(raw, _min, _del):
+    if np is not None:
+        if _del == 0.0:
+            return np.full(len(raw), 0xFFFF, dtype='<u2')
+
+        normalized = np.empty(len(raw), dtype='<u2')
+        for start in range(0, len(raw), CHUNK_ELEMENTS):
+            block = raw[start:start + CHUNK_ELEMENTS]
+            normalized[start:start + len(block)] = (block - np.float64(_min)) / _del * 0xFFFF
+        return normalized
 
     if _del == 0.0:
-        logging.warning("All values are identical. Writing flat white map (0xFFFF).")
-        normalized_data = [0xFFFF for _ in range(size ** 2)]
+        return array('H', [0xFFFF]) * len(raw)
+
+    def mut(v):
+        rel = v - _min
+        rel /= _del
+        rel *= 0xFFFF
+        return int(rel)
+
+    return array('H', map(mut, raw))
+
+def _validate_size(input_path, size):
+    if size is None:
+        return detect_size(input_path)
+
+    _check_size(input_path, size)
+    return size
+
+def _load_heights(input_path, size, streaming, reporter, digest=None):
+    size = _validate_size(input_path, size)
+
+    if streaming is None:
+        streaming = size >= STREAMING_MIN_SIZE
+
+    reporter.report(ConversionStage.READ, 0.0, force=True)
+
+    if streaming:
+        _min, _max, _del = scan_stats(input_path, size, reporter, STATS_PROGRESS_SHARE, digest)
+        blocks = iter_height_rows(input_path, size)
+        stats_share = STATS_PROGRESS_SHARE
     else:
-        def mut(v):
-            rel = v - _min
-            rel /= _del
-            rel *= 0xFFFF
-            return int(rel)
-        
-        normalized_data = list(map(mut, raw))
+        raw = open_heights(input_path, size)
+        if digest is not None:
+            digest.update(raw)
+        reporter.report(ConversionStage.READ, 0.0)
+        _min, _max, _del = _get_stats(raw)
+        reporter.report(ConversionStage.STATS, 0.0)
+        blocks = _iter_row_blocks(raw, size)
+        stats_share = 0.0
 
-    with open(output_path, 'wb') as stream:
-        data = struct.pack(f'{size ** 2}H', *normalized_data)
-        stream.write(data)
+    return _min, _max, _del, size, blocks, stats_share
 
-    json_path = _write_metadata(output_path, _min, _max, _del) if save_metadata else None
+def _cleanup_file(file_path):
+    try:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            logging.debug(f"Removed incomplete output: {file_path}")
+    except OSError as e:
+        logging.warning(f"Failed to remove incomplete output {file_path}: {e}")
 
-    return _min, _max, _del, json_path
+ENCODERS = {}
 
-def process_png(input_path, output_path, size, save_metadata=True):
-    with open(input_path, 'rb') as stream:
-        raw = struct.unpack(f'{size ** 2}f', stream.read())
+def register_encoder(name, extension=None):
+    def decorator(cls):
+        cls.extension = extension or f".{name}"
+        ENCODERS[name] = cls
+        return cls
+    return decorator
 
-    _min = min(raw)
-    _max = max(raw)
-    _del = _max - _min
+class Encoder:
+    extension = None
+    source = 'quantized'
 
-    if _del == 0.0:
-        logging.warning("All values are identical. Writing flat white image.")
-        normalized_data = [0xFFFF for _ in range(size ** 2)]
+    def __init__(self, output_path, size, stats, **options):
+        self.output_path = output_path
+        self.size = size
+        self.stats = stats
+        self.options = options
+        self.temp_path = output_path + '.tmp'
+        self._stream = open(self.temp_path, 'wb')
+
+    def write(self, block):
+        self._stream.write(block)
+
+    def close(self):
+        self._stream.close()
+        os.replace(self.temp_path, self.output_path)
+
+    def abort(self):
+        self._stream.close()
+        _cleanup_file(self.temp_path)
+
+@register_encoder('raw')
+class RawEncoder(Encoder):
+    pass
+
+@register_encoder('r16')
+class R16Encoder(RawEncoder):
+    pass
+
+@register_encoder('r32')
+class R32Encoder(Encoder):
+    source = 'heights'
+
+@register_encoder('npy')
+class NpyEncoder(Encoder):
+    source = 'heights'
+
+    def __init__(self, output_path, size, stats, **options):
+        super().__init__(output_path, size, stats, **options)
+
+        header = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({size}, {size}), }}"
+        header += ' ' * (-(len(header) + 11) % 64) + '\n'
+        self._stream.write(b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1'))
+
+@register_encoder('asc')
+class AscEncoder(Encoder):
+    source = 'heights'
+
+    def __init__(self, output_path, size, stats, **options):
+        super().__init__(output_path, size, stats, **options)
+
+        header = (
+            f"ncols {size}\n"
+            f"nrows {size}\n"
+            "xllcorner 0\n"
+            "yllcorner 0\n"
+            "cellsize 1\n"
+            "NODATA_value -9999\n"
+        )
+        self._stream.write(header.encode('ascii'))
+
+    def write(self, block):
+        if np is not None:
+            np.savetxt(self._stream, np.asarray(block).reshape(-1, self.size), fmt='%.9g')
+            return
+
+        for start in range(0, len(block), self.size):
+            row = ' '.join('%.9g' % v for v in block[start:start + self.size])
+            self._stream.write(row.encode('ascii') + b'\n')
+
+def _deflate_band(data, dictionary, compress_level, strategy):
+    if dictionary:
+        compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15, 9, strategy, dictionary)
     else:
-        def mut(v):
-            rel = v - _min
-            rel /= _del
-            rel *= 0xFFFF
-            return int(rel)
+        compressor = zlib.compressobj(compress_level, zlib.DEFLATED, -15, 9, strategy)
+
+    return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+class PngWriter:
+    def __init__(self, stream, width, height, compress_level=6, strategy=zlib.Z_DEFAULT_STRATEGY,
+                 filter_type='paeth', threads=1):
+        if filter_type not in PNG_FILTERS and filter_type != 'adaptive':
+            raise ValueError(f"Unknown PNG filter: {filter_type}")
+
+        self.stream = stream
+        self.width = width
+        self.height = height
+        self.compress_level = compress_level
+        self.strategy = strategy
+        self.filter_type = filter_type if np is not None else 'none'
+        self.band_rows = max(1, PNG_BAND_BYTES // (width * 2 + 1))
+        self.threads = threads
+        self._executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+        self._pending = []
+        self._previous = None
+        self._band = bytearray()
+        self._dictionary = b''
+        self._adler = 1
+
+        stream.write(b'\x89PNG\r\n\x1a\n')
+        self._write_chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 16, 0, 0, 0, 0))
+        self._write_chunk(b'IDAT', b'\x78\x9c')
 
-        normalized_data = list(map(mut, raw))
+    def _write_chunk(self, tag, data):
+        self.stream.write(struct.pack('>I', len(data)))
+        self.stream.write(tag)
+        self.stream.write(data)
+        self.stream.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(tag))))
 
-    image = Image.new('I;16', (size, size))
-    image.putdata(normalized_data)
-    image.save(output_path, format="png")
+    def _residuals(self, rows, filter_type):
+        above = np.empty_like(rows)
+        above[0] = np.frombuffer(self._previous, dtype=np.uint8) if self._previous else 0
+        above[1:] = rows[:-1]
+        left = np.zeros_like(rows)
+        left[:, 2:] = rows[:, :-2]
 
-    json_path = _write_metadata(output_path, _min, _max, _del) if save_metadata else None
+        if filter_type == 'sub':
+            return rows - left
+        if filter_type == 'up':
+            return rows - above
 
-    return _min, _max, _del, json_path
+        upper_left = np.zeros_like(rows)
+        upper_left[:, 2:] = above[:, :-2]
+        a, b, c = (v.astype(np.int16) for v in (left, above, upper_left))
+        estimate = a + b - c
+        pa, pb, pc = np.abs(estimate - a), np.abs(estimate - b), np.abs(estimate - c)
+        return rows - np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, above, upper_left))
 
-def _write_metadata(base_path, _min, _max, _del):
+    def _filter_band(self, data, filter_type):
+        stride = self.width * 2
+
+        if np is None or filter_type == 'none':
+            return b''.join(b'\x00' + data[i:i + stride] for i in range(0, len(data), stride))
+
+        rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)
+        filtered = np.empty((rows.shape[0], stride + 1), dtype=np.uint8)
+        filtered[:, 0] = PNG_FILTERS[filter_type]
+        filtered[:, 1:] = self._residuals(rows, filter_type)
+        return filtered.tobytes()
+
+    def write_rows(self, pixels):
+        band_size = self.band_rows * self.width * 2
+
+        for start in range(0, len(pixels), self.band_rows * self.width):
+            chunk = pixels[start:start + self.band_rows * self.width]
+            if np is not None:
+                self._band += np.asarray(chunk).astype('>u2').tobytes()
+            else:
+                rows = array('H', chunk)
+                if sys.byteorder == 'little':
+                    rows.byteswap()
+                self._band += rows.tobytes()
+
+            while len(self._band) >= band_size:
+                self._submit_band(bytes(self._band[:band_size]))
+                del self._band[:band_size]
+
+    def _deflate_candidates(self, data, dictionary):
+        candidates = [(self._filter_band(data, name), strategy) for name, strategy in PNG_ADAPTIVE_CANDIDATES]
+
+        if self._executor is None:
+            results = [_deflate_band(filtered, dictionary, self.compress_level, strategy)
+                       for filtered, strategy in candidates]
+        else:
+            futures = [self._executor.submit(_deflate_band, filtered, dictionary, self.compress_level, strategy)
+                       for filtered, strategy in candidates]
+            results = [future.result() for future in futures]
+
+        index = min(range(len(results)), key=lambda i: len(results[i]))
+        return candidates[index][0], results[index]
+
+    def _submit_band(self, data):
+        dictionary = self._dictionary
+
+        if self.filter_type == 'adaptive':
+            filtered, compressed = self._deflate_candidates(data, dictionary)
+        else:
+            filtered, compressed = self._filter_band(data, self.filter_type), None
+
+        self._previous = data[-self.width * 2:]
+        self._dictionary = filtered[-32768:]
+        self._adler = zlib.adler32(filtered, self._adler)
+
+        if compressed is not None:
+            self._write_chunk(b'IDAT', compressed)
+        elif self._executor is None:
+            self._write_chunk(b'IDAT', _deflate_band(filtered, dictionary, self.compress_level, self.strategy))
+        else:
+            self._pending.append(
+                self._executor.submit(_deflate_band, filtered, dictionary, self.compress_level, self.strategy)
+            )
+            while len(self._pending) > self.threads * 2:
+                self._write_chunk(b'IDAT', self._pending.pop(0).result())
+
+    def close(self):
+        try:
+            if self._band:
+                self._submit_band(bytes(self._band))
+                self._band = bytearray()
+
+            while self._pending:
+                self._write_chunk(b'IDAT', self._pending.pop(0).result())
+
+            tail = zlib.compressobj(self.compress_level, zlib.DEFLATED, -15).flush(zlib.Z_FINISH)
+            self._write_chunk(b'IDAT', tail + struct.pack('>I', self._adler))
+            self._write_chunk(b'IEND', b'')
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if self._executor is not None:
+            for future in self._pending:
+                future.cancel()
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+@register_encoder('png')
+class PngEncoder(Encoder):
+    def __init__(self, output_path, size, stats, profile=DEFAULT_PNG_PROFILE, threads=None, **options):
+        if profile not in PNG_PROFILES:
+            raise ValueError(f"Unknown PNG profile: {profile}")
+
+        if threads is None:
+            threads = (os.cpu_count() or 1) if size >= PNG_THREADS_MIN_SIZE else 1
+
+        super().__init__(output_path, size, stats, **options)
+        self.profile = profile
+        self.threads = threads
+        self._writer = PngWriter(self._stream, size, size, threads=threads, **PNG_PROFILES[profile])
+
+    def write(self, block):
+        self._writer.write_rows(block)
+
+    def close(self):
+        try:
+            self._writer.close()
+        finally:
+            self._stream.close()
+        os.replace(self.temp_path, self.output_path)
+
+    def abort(self):
+        self._writer.shutdown()
+        super().abort()
+
+@dataclass
+class ConversionResult:
+    min: float
+    max: float
+    delta: float
+    size: int
+    outputs: Dict[str, str] = field(default_factory=dict)
+    json_path: Optional[str] = None
+    skipped: bool = False
+
+def _new_digest():
+    return hashlib.blake2b(digest_size=32)
+
+def _format_digest(digest):
+    return f"blake2b:{digest.hexdigest()}"
+
+def hash_source(input_path):
+    digest = _new_digest()
+    buffer = bytearray(HASH_CHUNK_BYTES)
+    view = memoryview(buffer)
+
+    with open(input_path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+
+    return _format_digest(digest)
+
+def _encoder_params(outputs, options, base_dir):
+    params = {}
+    for fmt, output_path in outputs.items():
+        entry = {key: value for key, value in (options or {}).get(fmt, {}).items() if key not in RUNTIME_OPTIONS}
+        entry['File'] = os.path.relpath(output_path, base_dir)
+        params[fmt] = entry
+    return params
+
+def _load_current_metadata(json_path, source_hash, params, size, outputs):
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if (meta.get('SourceHash') != source_hash or meta.get('Outputs') != params
+            or meta.get('DGCVer') != DGCVER.decode('utf-8', errors='ignore')):
+        return None
+
+    if size is not None and meta.get('Size') != size:
+        return None
+
+    if not all(os.path.isfile(path) for path in outputs.values()):
+        return None
+
+    return meta
+
+def convert(input_path, outputs, size=None, save_metadata=True, streaming=None, options=None,
+            progress_callback=None, cancel_token=None, skip_unchanged=False, timings=None):
+    unknown = [fmt for fmt in outputs if fmt not in ENCODERS]
+    if unknown:
+        raise ValueError(f"Unsupported output format: {', '.join(unknown)}")
+
+    reporter = ProgressReporter(progress_callback, cancel_token, timings=timings)
+
+    size = _validate_size(input_path, size)
+
+    source_hash = params = digest = None
+    if save_metadata and outputs:
+        json_path = metadata_path(next(iter(outputs.values())))
+        params = _encoder_params(outputs, options, json_path.parent)
+
+        if skip_unchanged:
+            reporter.report(ConversionStage.READ, 0.0, force=True)
+            source_hash = hash_source(input_path)
+            meta = _load_current_metadata(json_path, source_hash, params, size, outputs)
+            if meta is not None:
+                logging.info(f"{input_path} is unchanged since the last conversion, skipping.")
+                reporter.report(ConversionStage.WRITE, 1.0, force=True)
+                return ConversionResult(meta['Min'], meta['Max'], meta['Delta'], meta['Size'], dict(outputs),
+                                        str(json_path), skipped=True)
+        else:
+            digest = _new_digest()
+
+    _min, _max, _del, size, blocks, stats_share = _load_heights(input_path, size, streaming, reporter, digest)
+    if digest is not None:
+        source_hash = _format_digest(digest)
+
+    if _del == 0.0:
+        logging.warning("All values are identical. Writing flat white output (0xFFFF).")
+
+    encoders = []
+    try:
+        for fmt, output_path in outputs.items():
+            encoder_options = (options or {}).get(fmt, {})
+            encoders.append(ENCODERS[fmt](output_path, size, (_min, _max, _del), **encoder_options))
+
+        needs_quantized = any(encoder.source == 'quantized' for encoder in encoders)
+
+        total = size ** 2
+        done = 0
+
+        for block in blocks:
+            progress = stats_share + (1.0 - stats_share) * done / total
+            reporter.report(ConversionStage.READ, progress)
+
+            if needs_quantized:
+                quantized = _quantize(block, _min, _del)
+                reporter.report(ConversionStage.QUANTIZE, progress)
+
+            for encoder in encoders:
+                encoder.write(quantized if encoder.source == 'quantized' else block)
+
+            done += len(block)
+            reporter.report(ConversionStage.ENCODE, stats_share + (1.0 - stats_share) * done / total)
+
+        for encoder in encoders:
+            encoder.close()
+    except BaseException:
+        for encoder in encoders:
+            encoder.abort()
+        raise
+
+    reporter.report(ConversionStage.WRITE, 1.0, force=True)
+
+    result = ConversionResult(_min, _max, _del, size, dict(outputs))
+
+    if save_metadata and outputs:
+        result.json_path = _write_metadata(next(iter(outputs.values())), _min, _max, _del, size, source_hash, params)
+
+    return result
+
+def process_raw(input_path, output_path, size=None, save_metadata=True, streaming=None,
+                progress_callback=None, cancel_token=None, timings=None):
+    result = convert(input_path, {'raw': output_path}, size, save_metadata, streaming,
+                     progress_callback=progress_callback, cancel_token=cancel_token, timings=timings)
+
+    return result.min, result.max, result.delta, result.json_path
+
+def process_png(input_path, output_path, size=None, save_metadata=True, streaming=None, profile=DEFAULT_PNG_PROFILE,
+                progress_callback=None, cancel_token=None, timings=None):
+    result = convert(input_path, {'png': output_path}, size, save_metadata, streaming, {'png': {'profile': profile}},
+                     progress_callback=progress_callback, cancel_token=cancel_token, timings=timings)
+
+    return result.min, result.max, result.delta, result.json_path
+
+def output_paths(base_path, formats):
+    return {fmt: base_path + ENCODERS[fmt].extension for fmt in formats}
+
+def metadata_path(base_path):
     output_dir = Path(base_path).parent
 
     mapname = output_dir.name
 
     json_filename = f"displace_{mapname}_metadata.json"
-    json_path = output_dir / json_filename
+    return output_dir / json_filename
+
+def _write_metadata(base_path, _min, _max, _del, size=None, source_hash=None, params=None):
+    json_path = metadata_path(base_path)
 
     meta = {
         'Min': _min,
@@ -76,9 +626,16 @@ def _write_metadata(base_path, _min, _max, _del):
         'DGCVer': DGCVER.decode('utf-8', errors='ignore')
     }
 
+    if size is not None:
+        meta['Size'] = size
+    if source_hash is not None:
+        meta['SourceHash'] = source_hash
+    if params is not None:
+        meta['Outputs'] = params
+
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(meta, f, indent=2)
 
     logging.info(f"Metadata saved to: {json_path}")
 
-    return str(json_path)
\ No newline at end of file
+    return str(json_path)
@@ -128,6 +128,18 @@ translations = {
         "open_github": "Open GitHub",
         "file_size": "File size",
         "speed": "Speed",
+        "auto_size": "Auto (detect from file)",
+        "size_mismatch_error": (
+            "Unable to determine the map size: the file length does not match a square map or the levelsize value in the map's .ssl file.\n"
+            "\n"
+            "For more information, see the help section."
+        ),
+        "png_profile": "PNG compression",
+        "png_fast": "Fast",
+        "png_balanced": "Balanced",
+        "png_archival": "Archival (smallest file)",
+        "raw_not_square": "The .raw file does not contain a square heightmap. Make sure you selected the correct file!",
+        "converting": "Converting...",
     },
 
     # Russian language
@@ -260,6 +272,18 @@ translations = {
         "open_github": "Открыть GitHub",
         "file_size": "Размер файла",
         "speed": "Скорость",
+        "auto_size": "Авто (определить по файлу)",
+        "size_mismatch_error": (
+            "Не удалось определить размер карты: размер файла не соответствует квадратной карте или значению levelsize в .ssl файле карты.\n"
+            "\n"
+            "Подробнее смотрите в разделе справки."
+        ),
+        "png_profile": "Сжатие PNG",
+        "png_fast": "Быстрое",
+        "png_balanced": "Сбалансированное",
+        "png_archival": "Архивное (наименьший файл)",
+        "raw_not_square": "Файл .raw не содержит квадратную карту высот. Убедитесь, что вы выбрали корректный файл!",
+        "converting": "Конвертация...",
     },
 
     # Ukrainian language
@@ -392,6 +416,18 @@ translations = {
         "open_github": "Відкрити GitHub",
         "file_size": "Розмір файлу",
         "speed": "Швидкість",
+        "auto_size": "Авто (визначити за файлом)",
+        "size_mismatch_error": (
+            "Не вдалося визначити розмір карти: розмір файлу не відповідає квадратній карті або значенню levelsize у .ssl файлі карти.\n"
+            "\n"
+            "Докладніше дивіться в розділі довідки."
+        ),
+        "png_profile": "Стиснення PNG",
+        "png_fast": "Швидке",
+        "png_balanced": "Збалансоване",
+        "png_archival": "Архівне (найменший файл)",
+        "raw_not_square": "Файл .raw не містить квадратну карту висот. Переконайтеся, що ви вибрали правильний файл!",
+        "converting": "Конвертація...",
     },
 
     # Polish language
@@ -524,6 +560,18 @@ translations = {
         "open_github": "Otwórz GitHub",
         "file_size": "Rozmiar pliku",
         "speed": "Prędkość",
+        "auto_size": "Auto (wykryj z pliku)",
+        "size_mismatch_error": (
+            "Nie udało się określić rozmiaru mapy: rozmiar pliku nie odpowiada kwadratowej mapie lub wartości levelsize w pliku .ssl mapy.\n"
+            "\n"
+            "Więcej informacji znajdziesz w sekcji pomocy."
+        ),
+        "png_profile": "Kompresja PNG",
+        "png_fast": "Szybka",
+        "png_balanced": "Zrównoważona",
+        "png_archival": "Archiwalna (najmniejszy plik)",
+        "raw_not_square": "Plik .raw nie zawiera kwadratowej mapy wysokości. Upewnij się, że wybrano właściwy plik!",
+        "converting": "Konwertowanie...",
     },
 
     # Belarusian language
@@ -658,5 +706,17 @@ translations = {
         "open_github": "Адкрыць GitHub",
         "file_size": "Памер файла",
         "speed": "Хуткасць",
+        "auto_size": "Аўта (вызначыць па файле)",
+        "size_mismatch_error": (
+            "Не ўдалося вызначыць памер карты: памер файла не адпавядае квадратнай карце або значэнню levelsize у .ssl файле карты.\n"
+            "\n"
+            "Падрабязней глядзіце ў раздзеле даведкі."
+        ),
+        "png_profile": "Сцісканне PNG",
+        "png_fast": "Хуткае",
+        "png_balanced": "Збалансаванае",
+        "png_archival": "Архіўнае (найменшы файл)",
+        "raw_not_square": "Файл .raw не змяшчае квадратную карту вышынь. Пераканайцеся, што вы выбралі правільны файл!",
+        "converting": "Канвертацыя...",
     }
 }
\ No newline at end of file
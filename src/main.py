@@ -1,19 +1,20 @@
-import flet as ft
 import sys
+import multiprocessing
 import logging
 import locale
-from screeninfo import get_monitors
 from lang_manager import LanguageManager
 from localization import translations
 
-try:
-    import tkinter as tk
-    from tkinter import messagebox
-except Exception:
-    tk = None
-    messagebox = None
-
 def check_min_resolution_or_exit(min_w=1280, min_h=720):
+    from screeninfo import get_monitors
+
+    try:
+        import tkinter as tk
+        from tkinter import messagebox
+    except Exception:
+        tk = None
+        messagebox = None
+
     try:
         monitor = get_monitors()[0]
         w, h = monitor.width, monitor.height
@@ -34,9 +35,6 @@ def check_min_resolution_or_exit(min_w=1280, min_h=720):
             print(msg)
         sys.exit(1)
 
-from ui import create_ui as create_main_ui
-from reverse_ui import create_back_ui as create_reverse_ui
-
 def get_system_language():
     try:
         locale.setlocale(locale.LC_ALL, '')
@@ -77,7 +75,10 @@ def get_language_from_args():
     
     return get_system_language()
 
-def main(page: ft.Page):
+def main(page):
+    from ui import create_ui as create_main_ui
+    from reverse_ui import create_back_ui as create_reverse_ui
+
     page.theme_mode = "dark"
     
     lang_code = get_language_from_args()
@@ -92,6 +93,30 @@ def main(page: ft.Page):
         create_main_ui(page, lang_code)
 
 
+def get_headless_command():
+    for flag in ("--batch", "--watch"):
+        if flag in sys.argv:
+            return flag[2:], [arg for arg in sys.argv[1:] if arg != flag]
+    return None, None
+
+def run_headless(command, args):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+    if command == "batch":
+        from batch import main as run_batch
+        return run_batch(args)
+
+    from watch import main as run_watch
+    return run_watch(args)
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
+
+    command, command_args = get_headless_command()
+    if command is not None:
+        sys.exit(run_headless(command, command_args))
+
+    import flet as ft
+
     check_min_resolution_or_exit()
     ft.app(target=main, name="DisplaceBox", view=ft.FLET_APP)
\ No newline at end of file
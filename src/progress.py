@@ -0,0 +1,80 @@
+import logging
+import time
+from enum import Enum
+from threading import Lock, Event
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL = 0.1
+
+class ConversionStage(Enum):
+    READ = "read"
+    STATS = "stats"
+    QUANTIZE = "quantize"
+    DEQUANTIZE = "dequantize"
+    ENCODE = "encode"
+    WRITE = "write"
+
+class ConversionCancelled(Exception):
+    pass
+
+class CancelToken:
+    def __init__(self):
+        self._cancelled = False
+        self._lock = Lock()
+        self._cancel_event = Event()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            self._cancel_event.set()
+        logger.info("Conversion cancellation requested")
+
+    def is_cancelled(self) -> bool:
+        with self._lock:
+            return self._cancelled
+
+    def reset(self) -> None:
+        with self._lock:
+            self._cancelled = False
+            self._cancel_event.clear()
+
+class ProgressReporter:
+    def __init__(
+        self,
+        callback: Optional[Callable[[float, ConversionStage], None]] = None,
+        cancel_token: Optional[CancelToken] = None,
+        interval: float = PROGRESS_INTERVAL,
+        timings: Optional[Dict[str, float]] = None
+    ):
+        self.callback = callback
+        self.cancel_token = cancel_token
+        self.interval = interval
+        self.timings = timings
+        self._last_report = 0.0
+        self._last_mark = time.perf_counter()
+
+    def check(self) -> None:
+        if self.cancel_token is not None and self.cancel_token.is_cancelled():
+            raise ConversionCancelled("Conversion cancelled by user")
+
+    def report(self, stage: ConversionStage, progress: float, force: bool = False) -> None:
+        self.check()
+
+        now = time.perf_counter()
+        if self.timings is not None:
+            self.timings[stage.value] = self.timings.get(stage.value, 0.0) + now - self._last_mark
+            self._last_mark = now
+
+        if self.callback is None:
+            return
+
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+
+        try:
+            self.callback(min(progress, 1.0), stage)
+        except Exception as e:
+            logger.error(f"Progress callback error: {e}")
@@ -1,13 +1,151 @@
-import struct
+from array import array
 from PIL import Image
 import os
 import logging
 import math
+from progress import ConversionStage, ProgressReporter
+from config import VERSION
+from functools import lru_cache
+from collections import OrderedDict
+from threading import Lock
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LUT_CACHE_SIZE = 8
+CHUNK_BYTES = 1 << 20
+STREAMING_MIN_BYTES = 8 * 1024 * 1024
+PNG_CACHE_SIZE = 4
 
 class RAWNot16BitError(Exception):
     pass
 
-def reverse_converter(input_path, output_path, json_data):
+class RAWNotSquareError(Exception):
+    pass
+
+class MetadataKeysError(Exception):
+    def __init__(self, keys):
+        super().__init__(f"Missing required field in JSON: {', '.join(keys)}")
+        self.keys = keys
+
+class DGCVerError(Exception):
+    pass
+
+class DGCVerFormatError(Exception):
+    pass
+
+def parse_version(version_str):
+    parts = version_str.split(".")
+    try:
+        major = int(parts[0])
+        minor = int(parts[1]) if len(parts) > 1 else 0
+    except (IndexError, ValueError):
+        return None, None
+    return major, minor
+
+def check_metadata(json_data, current_version=VERSION):
+    missing_keys = [key for key in ("Min", "Max", "Delta") if key not in json_data]
+    if missing_keys:
+        raise MetadataKeysError(missing_keys)
+
+    dgcver = json_data.get("DGCVer")
+    if not isinstance(dgcver, str) or not dgcver.startswith("DisplaceGUI_"):
+        raise DGCVerError(f"Invalid DGCVer: {dgcver!r}")
+
+    file_version = parse_version(dgcver[len("DisplaceGUI_"):])
+    current = parse_version(current_version)
+    if file_version[0] is None or current[0] is None:
+        raise DGCVerFormatError(f"Invalid version format: {dgcver!r}")
+
+    if file_version < current:
+        return "older"
+    if file_version > current:
+        return "newer"
+    return "current"
+
+def validate_raw(input_path):
+    file_size = os.path.getsize(input_path)
+    if not file_size:
+        raise ValueError("Input .raw file contains no data.")
+
+    if file_size % 2 != 0:
+        raise RAWNot16BitError("Input .raw file has incomplete 16-bit data.")
+
+    side = math.isqrt(file_size // 2)
+    if side * side * 2 != file_size:
+        raise RAWNotSquareError(f"Input .raw file is not a square heightmap ({file_size // 2} samples).")
+
+    return side
+
+@dataclass
+class PngInfo:
+    mode: str
+    width: int
+    height: int
+    extrema: tuple
+    pixels: Optional[bytes] = None
+
+_png_cache = OrderedDict()
+_png_cache_lock = Lock()
+
+def inspect_png(input_path, keep_pixels=False):
+    stat = os.stat(input_path)
+    key = (os.path.abspath(input_path), stat.st_mtime_ns, stat.st_size)
+
+    with _png_cache_lock:
+        info = _png_cache.get(key)
+        if info is not None:
+            _png_cache.move_to_end(key)
+            return info
+
+    with Image.open(input_path) as image:
+        image.load()
+        info = PngInfo(image.mode, image.width, image.height, image.getextrema())
+        if keep_pixels and image.mode == 'I;16':
+            info.pixels = image.tobytes()
+
+    with _png_cache_lock:
+        if info.pixels is not None:
+            for other in _png_cache.values():
+                other.pixels = None
+
+        _png_cache[key] = info
+        while len(_png_cache) > PNG_CACHE_SIZE:
+            _png_cache.popitem(last=False)
+
+    return info
+
+def _take_png_pixels(info):
+    with _png_cache_lock:
+        pixels, info.pixels = info.pixels, None
+    return pixels
+
+def _iter_sample_blocks(samples, chunk_samples=CHUNK_BYTES // 2):
+    for start in range(0, len(samples), chunk_samples):
+        yield samples[start:start + chunk_samples]
+
+def _iter_raw_blocks(input_path, streaming):
+    if not streaming:
+        with open(input_path, 'rb') as f:
+            yield from _iter_sample_blocks(memoryview(f.read()).cast('H'))
+        return
+
+    buffer = bytearray(CHUNK_BYTES)
+
+    with open(input_path, 'rb', buffering=0) as f:
+        while True:
+            read = f.readinto(buffer)
+            if not read:
+                break
+
+            yield memoryview(buffer)[:read].cast('H')
+
+def reverse_converter(input_path, output_path, json_data, streaming=None, progress_callback=None, cancel_token=None,
+                      timings=None):
     required_fields = ['Min', 'Max', 'Delta']
     for field in required_fields:
         if field not in json_data:
@@ -28,32 +166,71 @@ def reverse_converter(input_path, output_path, json_data):
     _, ext = os.path.splitext(input_path)
     ext = ext.lower()
 
+    reporter = ProgressReporter(progress_callback, cancel_token, timings=timings)
+    reporter.report(ConversionStage.READ, 0.0, force=True)
+
     if ext == '.raw':
-        with open(input_path, 'rb') as f:
-            data_bytes = f.read()
-            if not data_bytes:
-                raise ValueError("Input .raw file contains no data.")
+        side = validate_raw(input_path)
+        file_size = side * side * 2
+
+        if streaming is None:
+            streaming = file_size >= STREAMING_MIN_BYTES
 
-            if len(data_bytes) % 2 != 0:
-                raise RAWNot16BitError("Input .raw file has incomplete 16-bit data.")
-            
-            normalized_data = list(struct.unpack(f'{len(data_bytes)//2}H', data_bytes))
+        total = side * side
+        blocks = _iter_raw_blocks(input_path, streaming)
 
     elif ext == '.png':
-        image = Image.open(input_path)
-        if image.mode != 'I;16':
+        info = inspect_png(input_path, keep_pixels=True)
+        if info.mode != 'I;16':
             raise ValueError("Input PNG must be 16-bit integer grayscale")
-        normalized_data = list(image.getdata())
+
+        pixels = _take_png_pixels(info)
+        if pixels is None:
+            with Image.open(input_path) as image:
+                pixels = image.tobytes()
+        total = info.width * info.height
+        blocks = _iter_sample_blocks(memoryview(pixels).cast('H'))
     else:
         raise ValueError("Unsupported input format. Use .raw or .png")
-    
+
     if _del == 0.0:
         logging.warning("Delta is zero. Restoring flat value of min.")
-        raw_values = [_min] * len(normalized_data)
-    else:
-        raw_values = [(_val / 0xFFFF) * _del + _min for _val in normalized_data]
 
-    with open(output_path, 'wb') as f:
-        f.write(struct.pack(f'{len(raw_values)}f', *raw_values))
+    temp_path = output_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            done = 0
+            for block in blocks:
+                reporter.report(ConversionStage.READ, done / total)
+
+                raw_values = _dequantize(block, _min, _del)
+                reporter.report(ConversionStage.DEQUANTIZE, done / total)
+
+                f.write(raw_values)
+
+                done += len(block)
+                reporter.report(ConversionStage.WRITE, done / total)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    reporter.report(ConversionStage.WRITE, 1.0, force=True)
+
+    return _min, _max, _del
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def _dequantize_lut(_min, _del):
+    if np is not None:
+        return (np.arange(0x10000) / 0xFFFF * _del + _min).astype('<f4')
+
+    return array('f', [(_val / 0xFFFF) * _del + _min for _val in range(0x10000)])
+
+def _dequantize(normalized_data, _min, _del):
+    lut = _dequantize_lut(_min, _del)
+
+    if np is not None:
+        return lut.take(np.frombuffer(normalized_data, dtype='<u2'))
 
-    return _min, _max, _del
\ No newline at end of file
+    return array('f', map(lut.__getitem__, normalized_data))
@@ -1,14 +1,16 @@
 import flet as ft
 import locale
 from localization import translations
-from reverse_converter import reverse_converter, struct, RAWNot16BitError
+from progress import CancelToken, ConversionCancelled
+from reverse_converter import (reverse_converter, RAWNot16BitError, RAWNotSquareError, validate_raw, inspect_png,
+                              check_metadata, MetadataKeysError, DGCVerError, DGCVerFormatError)
 import os
 from resources import get_asset_path
 import logging
 from datetime import datetime
 import traceback
 import sys
-from PIL import Image
+import threading
 from config import VERSION, BUILD
 from ui_components import UIComponents, ThemeManager, LanguageDialog
 from lang_manager import LanguageManager
@@ -98,24 +100,24 @@ def create_back_ui(page: ft.Page, lang_code="En"):
 
                 if file_ext == ".png":
                     try:
-                        with Image.open(input_file_path) as img:
-                            if img.mode != 'I' and img.mode != 'I;16':
+                        png_info = inspect_png(input_file_path, keep_pixels=True)
+                        if png_info.mode != 'I' and png_info.mode != 'I;16':
+                            ui_components.show_error_dialog(lang["error"], lang["not_16bit_grayscale"])
+                            file_name.value = ""
+                            input_file_path = None
+                            logging.error("Selected PNG is not 16-bit grayscale!")
+                            page.update()
+                            return
+                        elif png_info.mode == 'I' or png_info.mode == 'I;16':
+                            if png_info.extrema[1] > 255:
+                                pass
+                            else:
                                 ui_components.show_error_dialog(lang["error"], lang["not_16bit_grayscale"])
                                 file_name.value = ""
                                 input_file_path = None
                                 logging.error("Selected PNG is not 16-bit grayscale!")
                                 page.update()
                                 return
-                            elif img.mode == 'I' or img.mode == 'I;16':
-                                if img.getextrema()[1] > 255:
-                                    pass
-                                else:
-                                    ui_components.show_error_dialog(lang["error"], lang["not_16bit_grayscale"])
-                                    file_name.value = ""
-                                    input_file_path = None
-                                    logging.error("Selected PNG is not 16-bit grayscale!")
-                                    page.update()
-                                    return
 
                     except Exception as ex:
                         ui_components.show_error_dialog(lang["error"], lang["invalid_png_file"])
@@ -133,10 +135,7 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                     return
                 elif file_ext == ".raw":
                     try:
-                        with open(input_file_path, "rb") as f:
-                            data_bytes = f.read()
-                            if len(data_bytes) % 2 != 0:
-                                raise RAWNot16BitError("Input .raw file has incomplete 16-bit data.")
+                        validate_raw(input_file_path)
                     except RAWNot16BitError as e:
                         ui_components.show_error_dialog(lang["error"], lang["incomplete_16bit_data"])
                         file_name.value = ""
@@ -144,6 +143,13 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                         logging.error(f"RAWNot16BitError: {e}")
                         page.update()
                         return
+                    except RAWNotSquareError as e:
+                        ui_components.show_error_dialog(lang["error"], lang["raw_not_square"])
+                        file_name.value = ""
+                        input_file_path = None
+                        logging.error(f"RAWNotSquareError: {e}")
+                        page.update()
+                        return
                     except Exception as e:
                         ui_components.show_error_dialog(lang["error"], lang["invalid_raw_file"])
                         file_name.value = ""
@@ -187,44 +193,19 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                 with open(json_file_path, "r") as f:
                     json_data = json.load(f)
 
-                required_keys = ["Min", "Max", "Delta"]
-                missing_keys = [key for key in required_keys if key not in json_data]
-                if missing_keys:
-                    error_msg = lang["invalid_json_missing_keys"].format(keys=", ".join(missing_keys))
-                    ui_components.show_error_dialog(lang["error"], error_msg)
-                    json_file_path = None
-                    json_data = {}
-                    json_field.value = ""
-                    page.update()
-                    return
-
-                dgcver = json_data.get("DGCVer")
-                current_version = VERSION
-
-                if not dgcver or not dgcver.startswith("DisplaceGUI_"):
-                    ui_components.show_error_dialog(lang["error"], lang["invalid_json_dgcver"])
-                    json_file_path = None
-                    json_data = {}
-                    json_field.value = ""
-                    page.update()
-                    return
-
-                file_version_str = dgcver[len("DisplaceGUI_"):]
-
-                def parse_version(version_str):
-                    parts = version_str.split(".")
-                    try:
-                        major = int(parts[0])
-                        minor = int(parts[1]) if len(parts) > 1 else 0
-                    except (IndexError, ValueError):
-                        return None, None
-                    return major, minor
-
-                file_major, file_minor = parse_version(file_version_str)
-                current_major, current_minor = parse_version(current_version)
+                try:
+                    version_age = check_metadata(json_data)
+                except MetadataKeysError as ex:
+                    error_msg = lang["invalid_json_missing_keys"].format(keys=", ".join(ex.keys))
+                except DGCVerError:
+                    error_msg = lang["invalid_json_dgcver"]
+                except DGCVerFormatError:
+                    error_msg = lang["invalid_json_version_format"]
+                else:
+                    error_msg = None
 
-                if file_major is None or current_major is None:
-                    ui_components.show_error_dialog(lang["error"], lang["invalid_json_version_format"])
+                if error_msg:
+                    ui_components.show_error_dialog(lang["error"], error_msg)
                     json_file_path = None
                     json_data = {}
                     json_field.value = ""
@@ -242,7 +223,7 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                     json_field.value = ""
                     page.update()
 
-                if file_major < current_major or (file_major == current_major and file_minor < current_minor):
+                if version_age == "older":
                     def show_confirm_dialog():
                         def close_dialog():
                             dlg.open = False
@@ -271,7 +252,7 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                     show_confirm_dialog()
                     return
 
-                elif file_major > current_major or (file_major == current_major and file_minor > current_minor):
+                elif version_age == "newer":
                     def show_confirm_dialog():
                         def close_dialog():
                             dlg.open = False
@@ -442,87 +423,91 @@ def create_back_ui(page: ft.Page, lang_code="En"):
                 logging.info(f"Converted file saved to: {output_path}")
                 page.update()
 
-            try:
-                _min, _max, _del = reverse_converter(input_file_path, output_path, json_data)
-                show_success_dialog(_min, _max, _del)
-            except struct.error as e:
-                def close_banner(e):
-                    errordialog.open = False
-                    page.update()
-                errordialog = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.RED_900,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.WARNING, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+            cancel_token = CancelToken()
+
+            def cancel_conversion(e):
+                cancel_token.cancel()
+
+            progress_dlg, update_progress = ui_components.create_progress_dialog(cancel_conversion)
+
+            def run_conversion():
+                try:
+                    _min, _max, _del = reverse_converter(input_file_path, output_path, json_data,
+                                                         progress_callback=update_progress, cancel_token=cancel_token)
+                    show_success_dialog(_min, _max, _del)
+                except ZeroDivisionError as e:
+                    def close_zerbanner(e):
+                        zererrordialog.open = False
+                        page.update()
+                    zererrordialog = ft.AlertDialog(
+                        open=True,
+                        bgcolor=ft.Colors.RED_ACCENT_700,
+                        title=ft.Row(
+                            [
+                                ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
+                                ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                            ],
+                            spacing=10,
+                            alignment=ft.MainAxisAlignment.START,
+                        ),
+                        content=ft.Text(lang["zerodiv_error"], color=ft.Colors.WHITE),
+                        actions=[
+                            ft.TextButton("OK", on_click=close_zerbanner, style=ft.ButtonStyle(color=ft.Colors.WHITE)),
+                            ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
                         ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Text(lang["struct_error"], color=ft.Colors.WHITE),
-                    actions=[
-                        ft.TextButton("OK", on_click=close_banner, style=ft.ButtonStyle(color=ft.Colors.WHITE)),
-                        ft.TextButton(lang["help"], on_click=lambda e: [close_banner(e), helpdialog(e)], style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                )
-                logging.error(f"struct.error occurred: {e}")
-                logging.error("Traceback:\n" + traceback.format_exc())
-                page.overlay.append(errordialog)
-                page.update()
-            except ZeroDivisionError as e:
-                def close_zerbanner(e):
-                    zererrordialog.open = False
+                        actions_alignment=ft.MainAxisAlignment.END,
+                    )
+                    logging.error(f"ZeroDivisionError occurred: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    page.overlay.append(zererrordialog)
                     page.update()
-                zererrordialog = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.RED_ACCENT_700,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                except (RAWNot16BitError, RAWNotSquareError) as e:
+                    error_key = "incomplete_16bit_data" if isinstance(e, RAWNot16BitError) else "raw_not_square"
+                    ui_components.show_error_dialog(lang["error"], lang[error_key])
+                    logging.error(f"{type(e).__name__}: {e}")
+                except ValueError as e:
+                    def close_valbanner(e):
+                        valerrordialog.open = False
+                        page.update()
+                    valerrordialog = ft.AlertDialog(
+                        open=True,
+                        bgcolor=ft.Colors.RED_ACCENT_700,
+                        title=ft.Row(
+                            [
+                                ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
+                                ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                            ],
+                            spacing=10,
+                            alignment=ft.MainAxisAlignment.START,
+                        ),
+                        content=ft.Text(lang["unsupportedfile"], color=ft.Colors.WHITE),
+                        actions=[
+                            ft.TextButton("OK", on_click=close_valbanner, style=ft.ButtonStyle(color=ft.Colors.WHITE)),
+                            ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
                         ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Text(lang["zerodiv_error"], color=ft.Colors.WHITE),
-                    actions=[
-                        ft.TextButton("OK", on_click=close_zerbanner, style=ft.ButtonStyle(color=ft.Colors.WHITE)),
-                        ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                )
-                logging.error(f"ZeroDivisionError occurred: {e}")
-                logging.error("Traceback:\n" + traceback.format_exc())
-                page.overlay.append(zererrordialog)
-                page.update()
-            except ValueError as e:
-                def close_valbanner(e):
-                    valerrordialog.open = False
+                        actions_alignment=ft.MainAxisAlignment.END,
+                    )
+                    logging.error(f"ValueError occurred: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    page.overlay.append(valerrordialog)
                     page.update()
-                valerrordialog = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.RED_ACCENT_700,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
-                        ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Text(lang["unsupportedfile"], color=ft.Colors.WHITE),
-                    actions=[
-                        ft.TextButton("OK", on_click=close_valbanner, style=ft.ButtonStyle(color=ft.Colors.WHITE)),
-                        ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                )
-                logging.error(f"ValueError occurred: {e}")
-                logging.error("Traceback:\n" + traceback.format_exc())
-                page.overlay.append(valerrordialog)
-                page.update()
+                except ConversionCancelled:
+                    logging.info("Conversion cancelled by user")
+                except Exception as e:
+                    logging.error(f"Conversion failed: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    ui_components.show_error_dialog(lang["error"], f"{lang['unexpected_error']}: {e}")
+                finally:
+                    progress_dlg.open = False
+                    process_button.disabled = False
+                    page.update()
+
+            process_button.disabled = True
+            page.overlay.append(progress_dlg)
+            progress_dlg.open = True
+            page.update()
+
+            threading.Thread(target=run_conversion, daemon=True).start()
         else:
             def close_dlgpleaseselfile(e):
                 plsselfile.open = False
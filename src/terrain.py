@@ -0,0 +1,147 @@
+import argparse
+import os
+import random
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TERRAIN_KINDS = ('hills', 'plateaus', 'flat_regions', 'identical')
+HEIGHT_SCALE = 100.0
+BASE_CELLS = 4
+MIN_CELL_PIXELS = 4
+PERSISTENCE = 0.5
+PLATEAU_LEVEL = 0.1
+FLAT_LEVEL = 0.15
+BLOCK_ROWS = 256
+
+def _octaves(size):
+    octaves = []
+    cells = BASE_CELLS
+    amplitude = 1.0
+    while cells * MIN_CELL_PIXELS <= size or not octaves:
+        octaves.append((cells, amplitude))
+        cells *= 2
+        amplitude *= PERSISTENCE
+    return octaves
+
+def _shape(heights, kind):
+    if kind == 'plateaus':
+        return [min(h, PLATEAU_LEVEL) for h in heights]
+    if kind == 'flat_regions':
+        return [max(h - FLAT_LEVEL, 0.0) for h in heights]
+    return heights
+
+def _np_shape(heights, kind):
+    if kind == 'plateaus':
+        return np.minimum(heights, np.float32(PLATEAU_LEVEL))
+    if kind == 'flat_regions':
+        return np.maximum(heights - np.float32(FLAT_LEVEL), 0)
+    return heights
+
+def _smooth(t):
+    return t * t * (3 - 2 * t)
+
+def _np_axis(size, cells):
+    coords = np.arange(size, dtype=np.float32) * np.float32(cells / size)
+    index = coords.astype(np.intp)
+    return index, _smooth(coords - index)
+
+def _np_lattice_rows(rng, size, cells, amplitude):
+    lattice = (rng.random((cells + 1, cells + 1), dtype=np.float32) * 2 - 1) * np.float32(amplitude)
+    xi, sx = _np_axis(size, cells)
+    left = lattice[:, xi]
+    return left + (lattice[:, xi + 1] - left) * sx
+
+def _iter_np_blocks(size, kind, seed):
+    rng = np.random.default_rng(seed)
+    octaves = [(cells, _np_lattice_rows(rng, size, cells, amplitude)) for cells, amplitude in _octaves(size)]
+    norm = np.float32(1.0 / sum(amplitude for _, amplitude in _octaves(size)))
+
+    for start in range(0, size, BLOCK_ROWS):
+        stop = min(start + BLOCK_ROWS, size)
+        heights = np.zeros((stop - start, size), dtype=np.float32)
+
+        for cells, rows in octaves:
+            yi, sy = _np_axis(size, cells)
+            yi, sy = yi[start:stop], sy[start:stop, None]
+
+            top = rows[yi]
+            heights += top
+            top -= rows[yi + 1]
+            top *= sy
+            heights -= top
+
+        heights *= norm
+        yield (_np_shape(heights, kind) * np.float32(HEIGHT_SCALE)).astype('<f4', copy=False)
+
+def _iter_py_blocks(size, kind, seed):
+    rng = random.Random(seed)
+    octaves = []
+    for cells, amplitude in _octaves(size):
+        lattice = [[rng.random() * 2 - 1 for _ in range(cells + 1)] for _ in range(cells + 1)]
+        xi = [col * cells // size for col in range(size)]
+        sx = [_smooth(col * cells / size - index) for col, index in enumerate(xi)]
+        octaves.append((cells, amplitude, lattice, xi, sx))
+    norm = 1.0 / sum(octave[1] for octave in octaves)
+
+    for row in range(size):
+        heights = [0.0] * size
+        for cells, amplitude, lattice, xi, sx in octaves:
+            y = row * cells / size
+            yi = int(y)
+            sy = _smooth(y - yi)
+            top, bottom = lattice[yi], lattice[yi + 1]
+            for col in range(size):
+                i, t = xi[col], sx[col]
+                a = top[i] + (top[i + 1] - top[i]) * t
+                b = bottom[i] + (bottom[i + 1] - bottom[i]) * t
+                heights[col] += (a + (b - a) * sy) * amplitude
+        yield array('f', [h * HEIGHT_SCALE for h in _shape([h * norm for h in heights], kind)])
+
+def iter_terrain_rows(size, kind='hills', seed=0):
+    if kind not in TERRAIN_KINDS:
+        raise ValueError(f"Unknown terrain kind: {kind}")
+
+    if kind == 'identical':
+        row = np.zeros(size, dtype='<f4') if np is not None else array('f', bytes(size * 4))
+        for _ in range(size):
+            yield row
+        return
+
+    if np is not None:
+        yield from _iter_np_blocks(size, kind, seed)
+    else:
+        yield from _iter_py_blocks(size, kind, seed)
+
+def write_displace(path, size, kind='hills', seed=0):
+    with open(path, 'wb') as f:
+        for block in iter_terrain_rows(size, kind, seed):
+            block.tofile(f)
+
+def build_corpus(output_dir, sizes, kinds=TERRAIN_KINDS, seed=0):
+    paths = []
+    for kind in kinds:
+        for size in sizes:
+            map_dir = os.path.join(output_dir, f"{kind}_{size}")
+            os.makedirs(map_dir, exist_ok=True)
+            path = os.path.join(map_dir, "displace.bin")
+            write_displace(path, size, kind, seed)
+            paths.append(path)
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic displace.bin terrain")
+    parser.add_argument('output_dir')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[512, 1024, 2048, 4096])
+    parser.add_argument('--kinds', nargs='+', choices=TERRAIN_KINDS, default=list(TERRAIN_KINDS))
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for path in build_corpus(args.output_dir, args.sizes, args.kinds, args.seed):
+        print(path)
+
+if __name__ == "__main__":
+    main()
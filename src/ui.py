@@ -8,7 +8,8 @@ from datetime import datetime
 import traceback
 from screeninfo import get_monitors
 from updater import UpdateDownloader, check_for_updates, download_update
-from converter import process_raw, process_png, struct, _write_metadata
+from converter import convert, output_paths, MapSizeError, DEFAULT_PNG_PROFILE
+from progress import CancelToken, ConversionCancelled
 import subprocess
 import threading
 import time
@@ -224,6 +225,16 @@ def create_ui(page: ft.Page, lang_code="En"):
                     size=int(15 * scale_factor),
                     weight=ft.FontWeight.W_500
                 )
+            ),
+            ft.Container(width=int(20 * scale_factor)),
+            ft.Radio(
+                label=".raw + .png",
+                value="BOTH",
+                scale=scale_factor,
+                label_style=ft.TextStyle(
+                    size=int(15 * scale_factor),
+                    weight=ft.FontWeight.W_500
+                )
             )
         ], 
         alignment=ft.MainAxisAlignment.CENTER,
@@ -232,12 +243,16 @@ def create_ui(page: ft.Page, lang_code="En"):
 
     output_size = ft.Container(
         content=ft.Dropdown(
+            value="auto",
             options=[
+                ft.dropdown.Option(key="auto", text=lang["auto_size"]),
                 ft.dropdown.Option(key="64", text="4x4"),
                 ft.dropdown.Option(key="128", text="8x8"),
                 ft.dropdown.Option(key="256", text="16x16"),
                 ft.dropdown.Option(key="512", text="32x32"),
-                ft.dropdown.Option(key="1024", text="64x64")
+                ft.dropdown.Option(key="1024", text="64x64"),
+                ft.dropdown.Option(key="2048", text="128x128"),
+                ft.dropdown.Option(key="4096", text="256x256")
             ],
             label=lang["select_size"],
             label_style=ft.TextStyle(size=int(12 * scale_factor)),
@@ -252,6 +267,27 @@ def create_ui(page: ft.Page, lang_code="En"):
         height=int(35 * scale_factor)
     )
 
+    png_profile = ft.Container(
+        content=ft.Dropdown(
+            value=DEFAULT_PNG_PROFILE,
+            options=[
+                ft.dropdown.Option(key="fast", text=lang["png_fast"]),
+                ft.dropdown.Option(key="balanced", text=lang["png_balanced"]),
+                ft.dropdown.Option(key="archival", text=lang["png_archival"])
+            ],
+            label=lang["png_profile"],
+            label_style=ft.TextStyle(size=int(12 * scale_factor)),
+            text_style=ft.TextStyle(size=int(12 * scale_factor)),
+            border_color="#46678F",
+            content_padding=ft.padding.symmetric(
+                horizontal=int(12 * scale_factor),
+                vertical=int(4 * scale_factor)
+            ),
+            width=int(350 * scale_factor)
+        ),
+        height=int(35 * scale_factor)
+    )
+
     process_button = ft.ElevatedButton(
         text=lang["convert_file"], 
         on_click=lambda e: process_file(e), 
@@ -272,115 +308,143 @@ def create_ui(page: ft.Page, lang_code="En"):
 
     def process_file(e):
         if input_file_path and output_format.value and output_size.content.value:
-            try:
-                size = int(output_size.content.value)
-            except Exception:
+            if output_size.content.value == "auto":
+                size = None
+            else:
                 try:
-                    size = int(output_size.content.options[0].key)
+                    size = int(output_size.content.value)
                 except Exception:
-                    size = 64
+                    size = None
 
-            output_path = os.path.splitext(input_file_path)[0] + (".raw" if output_format.value == "RAW" else ".png")
+            base_path = os.path.splitext(input_file_path)[0]
+            formats = ["raw", "png"] if output_format.value == "BOTH" else [output_format.value.lower()]
+            outputs = output_paths(base_path, formats)
+            output_path = "\n".join(outputs.values())
 
-            try:
-                if output_format.value == "RAW":
-                    _min, _max, _del, json_path = process_raw(input_file_path, output_path, size, True)
-                else:
-                    _min, _max, _del, json_path = process_png(input_file_path, output_path, size, True)
+            cancel_token = CancelToken()
 
-                def close_dlgconvert(e):
-                    convertsuc.open = False
-                    page.update()
+            def cancel_conversion(e):
+                cancel_token.cancel()
 
-                content_controls = [
-                    ft.Text(f"{lang['file_saved']}:", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
-                    ft.Text(output_path, size=12, width=450, color=ft.Colors.WHITE),
-                ]
+            progress_dlg, update_progress = ui_components.create_progress_dialog(cancel_conversion)
 
-                if json_path:
-                    content_controls.extend([
-                        ft.Text(f"{lang['meta_path']}", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
-                        ft.Text(json_path, size=12, width=450, color=ft.Colors.WHITE),
-                    ])
+            def run_conversion():
+                try:
+                    profile = png_profile.content.value or DEFAULT_PNG_PROFILE
+                    result = convert(input_file_path, outputs, size, True, options={"png": {"profile": profile}},
+                                     progress_callback=update_progress, cancel_token=cancel_token)
+                    _min, _max, _del, json_path = result.min, result.max, result.delta, result.json_path
 
-                convertsuc = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.GREEN_900,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.CHECK, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["result"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
-                        ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Column(content_controls, tight=True),
-                    actions=[
-                        ft.TextButton("OK", on_click=close_dlgconvert, style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                    on_dismiss=lambda e: logging.info(f"Min: {_min:.1f}, Max: {_max:.1f}, Delta: {_del:.1f}"),
-                )
-                page.overlay.append(convertsuc)
-                logging.info(f"Converted file saved to: {output_path}")
-                page.update()
+                    def close_dlgconvert(e):
+                        convertsuc.open = False
+                        page.update()
 
-            except struct.error as e:
-                def close_banner(e):
-                    errordialog.open = False
+                    content_controls = [
+                        ft.Text(f"{lang['file_saved']}:", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+                        ft.Text(output_path, size=12, width=450, color=ft.Colors.WHITE),
+                    ]
+
+                    if json_path:
+                        content_controls.extend([
+                            ft.Text(f"{lang['meta_path']}", size=14, weight=ft.FontWeight.BOLD, color=ft.Colors.WHITE),
+                            ft.Text(json_path, size=12, width=450, color=ft.Colors.WHITE),
+                        ])
+
+                    convertsuc = ft.AlertDialog(
+                        open=True,
+                        bgcolor=ft.Colors.GREEN_900,
+                        title=ft.Row(
+                            [
+                                ft.Icon(ft.Icons.CHECK, size=30, color=ft.Colors.WHITE),
+                                ft.Text(lang["result"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                            ],
+                            spacing=10,
+                            alignment=ft.MainAxisAlignment.START,
+                        ),
+                        content=ft.Column(content_controls, tight=True),
+                        actions=[
+                            ft.TextButton("OK", on_click=close_dlgconvert, style=ft.ButtonStyle(color=ft.Colors.WHITE))
+                        ],
+                        actions_alignment=ft.MainAxisAlignment.END,
+                        on_dismiss=lambda e: logging.info(f"Min: {_min:.1f}, Max: {_max:.1f}, Delta: {_del:.1f}"),
+                    )
+                    page.overlay.append(convertsuc)
+                    logging.info(f"Converted file saved to: {output_path}")
                     page.update()
 
-                errordialog = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.RED_900,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.WARNING, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
-                        ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Text(lang["struct_error"], color=ft.Colors.WHITE),
-                    actions=[
-                        ft.TextButton("OK", on_click=lambda e: close_banner(e), style=ft.ButtonStyle(color=ft.Colors.WHITE)),
-                        ft.TextButton(lang["help"], on_click=lambda e: [close_banner(e), helpdialog(e)], style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                )
+                except MapSizeError as e:
+                    def close_banner(e):
+                        errordialog.open = False
+                        page.update()
 
-                logging.error(f"struct.error occurred: {e}")
-                logging.error("Traceback:\n" + traceback.format_exc())
-                page.overlay.append(errordialog)
-                page.update()
+                    errordialog = ft.AlertDialog(
+                        open=True,
+                        bgcolor=ft.Colors.RED_900,
+                        title=ft.Row(
+                            [
+                                ft.Icon(ft.Icons.WARNING, size=30, color=ft.Colors.WHITE),
+                                ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                            ],
+                            spacing=10,
+                            alignment=ft.MainAxisAlignment.START,
+                        ),
+                        content=ft.Text(lang["size_mismatch_error"] if size is None else lang["struct_error"], color=ft.Colors.WHITE),
+                        actions=[
+                            ft.TextButton("OK", on_click=lambda e: close_banner(e), style=ft.ButtonStyle(color=ft.Colors.WHITE)),
+                            ft.TextButton(lang["help"], on_click=lambda e: [close_banner(e), helpdialog(e)], style=ft.ButtonStyle(color=ft.Colors.WHITE))
+                        ],
+                        actions_alignment=ft.MainAxisAlignment.END,
+                    )
 
-            except ZeroDivisionError as e:
-                def close_zerbanner(e):
-                    zererrordialog.open = False
+                    logging.error(f"{type(e).__name__} occurred: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    page.overlay.append(errordialog)
                     page.update()
 
-                zererrordialog = ft.AlertDialog(
-                    open=True,
-                    bgcolor=ft.Colors.RED_ACCENT_700,
-                    title=ft.Row(
-                        [
-                            ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
-                            ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                except ZeroDivisionError as e:
+                    def close_zerbanner(e):
+                        zererrordialog.open = False
+                        page.update()
+
+                    zererrordialog = ft.AlertDialog(
+                        open=True,
+                        bgcolor=ft.Colors.RED_ACCENT_700,
+                        title=ft.Row(
+                            [
+                                ft.Icon(ft.Icons.ERROR, size=30, color=ft.Colors.WHITE),
+                                ft.Text(lang["error"], style=ft.TextThemeStyle.TITLE_MEDIUM, color=ft.Colors.WHITE),
+                            ],
+                            spacing=10,
+                            alignment=ft.MainAxisAlignment.START,
+                        ),
+                        content=ft.Text(lang["zerodiv_error"], color=ft.Colors.WHITE),
+                        actions=[
+                            ft.TextButton("OK", on_click=lambda e: close_zerbanner(e), style=ft.ButtonStyle(color=ft.Colors.WHITE)),
+                            ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
                         ],
-                        spacing=10,
-                        alignment=ft.MainAxisAlignment.START,
-                    ),
-                    content=ft.Text(lang["zerodiv_error"], color=ft.Colors.WHITE),
-                    actions=[
-                        ft.TextButton("OK", on_click=lambda e: close_zerbanner(e), style=ft.ButtonStyle(color=ft.Colors.WHITE)),
-                        ft.TextButton(lang["opengit"], on_click=lambda e: page.launch_url("https://github.com/stakanyash/displacebin_gui_converter/issues/new"), style=ft.ButtonStyle(color=ft.Colors.WHITE))
-                    ],
-                    actions_alignment=ft.MainAxisAlignment.END,
-                )
-                logging.error(f"ZeroDivisionError occurred: {e}")
-                logging.error("Traceback:\n" + traceback.format_exc())
-                page.overlay.append(zererrordialog)
-                page.update()
+                        actions_alignment=ft.MainAxisAlignment.END,
+                    )
+                    logging.error(f"ZeroDivisionError occurred: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    page.overlay.append(zererrordialog)
+                    page.update()
+                except ConversionCancelled:
+                    logging.info("Conversion cancelled by user")
+                except Exception as e:
+                    logging.error(f"Conversion failed: {e}")
+                    logging.error("Traceback:\n" + traceback.format_exc())
+                    ui_components.show_error_dialog(lang["error"], f"{lang['unexpected_error']}: {e}")
+                finally:
+                    progress_dlg.open = False
+                    process_button.disabled = False
+                    page.update()
+
+            process_button.disabled = True
+            page.overlay.append(progress_dlg)
+            progress_dlg.open = True
+            page.update()
+
+            threading.Thread(target=run_conversion, daemon=True).start()
 
         else:
             if not input_file_path or not output_format.value or not output_size.content.value:
@@ -429,8 +493,14 @@ def create_ui(page: ft.Page, lang_code="En"):
             output_format_text.value = lang["select_format"]
             output_format.content.controls[0].label = ".raw"
             output_format.content.controls[2].label = ".png"
+            output_format.content.controls[4].label = ".raw + .png"
             try:
                 output_size.content.label = lang["select_size"]
+                output_size.content.options[0].text = lang["auto_size"]
+                png_profile.content.label = lang["png_profile"]
+                png_profile.content.options[0].text = lang["png_fast"]
+                png_profile.content.options[1].text = lang["png_balanced"]
+                png_profile.content.options[2].text = lang["png_archival"]
             except Exception:
                 pass
             process_button.text = lang["convert_file"]
@@ -481,6 +551,7 @@ def create_ui(page: ft.Page, lang_code="En"):
             
             try:
                 output_size.content.border_color = colors['border_color']
+                png_profile.content.border_color = colors['border_color']
             except Exception:
                 pass
             file_name.border_color = colors['border_color']
@@ -544,15 +615,21 @@ def create_ui(page: ft.Page, lang_code="En"):
                             output_format_text,
                             ft.Container(height=int(10 * scale_factor)),
                             output_format,
-                            ft.Container(height=int(30 * scale_factor)),
+                            ft.Container(height=int(15 * scale_factor)),
                             ft.Container(
                                 content=output_size,
                                 width=int(300 * scale_factor),
                                 alignment=ft.alignment.center,
                             ),
-                            ft.Container(height=int(30 * scale_factor)),
-                            process_button,
+                            ft.Container(height=int(15 * scale_factor)),
+                            ft.Container(
+                                content=png_profile,
+                                width=int(300 * scale_factor),
+                                alignment=ft.alignment.center,
+                            ),
                             ft.Container(height=int(20 * scale_factor)),
+                            process_button,
+                            ft.Container(height=int(5 * scale_factor)),
                         ],
                         spacing=0,
                         horizontal_alignment=ft.CrossAxisAlignment.CENTER,
@@ -120,6 +120,37 @@ class UIComponents:
         self.page.overlay.append(error_dialog)
         self.page.update()
 
+    def create_progress_dialog(self, on_cancel):
+        progress_bar = ft.ProgressBar(width=400, value=0, color="PRIMARY")
+        progress_text = ft.Text("0%", size=12, color=ft.Colors.GREY_500)
+
+        progress_dialog = ft.AlertDialog(
+            modal=True,
+            title=ft.Row([
+                ft.Icon(ft.Icons.HOURGLASS_TOP, color=ft.Colors.BLUE_400),
+                ft.Text(self.lang["converting"]),
+            ]),
+            content=ft.Column([
+                progress_bar,
+                ft.Container(
+                    content=progress_text,
+                    alignment=ft.alignment.center_right,
+                    padding=ft.padding.only(top=5)
+                ),
+            ], tight=True),
+            actions=[
+                ft.TextButton(self.lang["cancel"], on_click=on_cancel)
+            ],
+            actions_alignment=ft.MainAxisAlignment.END,
+        )
+
+        def update_progress(value, stage=None):
+            progress_bar.value = value
+            progress_text.value = f"{value * 100:.0f}%"
+            self.page.update()
+
+        return progress_dialog, update_progress
+
     def create_toolbar_buttons(self, on_help, on_language, on_theme, on_mode_switch, mode_tooltip_key="modeswitch2"):
         icon_color = ThemeManager.get_theme_colors(self.page.theme_mode)['icon_color']
         
@@ -0,0 +1,149 @@
+import argparse
+import logging
+import os
+import time
+
+from batch import parse_formats, map_input_kind, load_metadata
+from converter import convert, output_paths, metadata_path, ENCODERS, DEFAULT_PNG_PROFILE, PNG_PROFILES
+from reverse_converter import reverse_converter
+
+POLL_INTERVAL = 0.5
+DEBOUNCE_SECONDS = 1.0
+
+class DirectoryWatcher:
+    def __init__(self, root, formats, size=None, profile=DEFAULT_PNG_PROFILE, allow_version_mismatch=False,
+                 debounce=DEBOUNCE_SECONDS):
+        self.root = root
+        self.formats = formats
+        self.size = size
+        self.profile = profile
+        self.allow_version_mismatch = allow_version_mismatch
+        self.debounce = debounce
+        self._known = self._scan()
+        self._pending = {}
+
+    def _scan(self):
+        snapshot = {}
+        for root, dirs, files in os.walk(self.root):
+            for name in files:
+                if map_input_kind(name) is None:
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def poll(self):
+        now = time.monotonic()
+        current = self._scan()
+
+        for path, signature in current.items():
+            if self._known.get(path) != signature:
+                self._pending[path] = (now, signature)
+
+        self._known = current
+
+        ready = [
+            path for path, (changed_at, signature) in self._pending.items()
+            if now - changed_at >= self.debounce and current.get(path) == signature
+        ]
+
+        processed = []
+        for path in ready:
+            del self._pending[path]
+            outputs = self._process(path)
+            processed.append(path)
+            self._remember(outputs)
+
+        for path in [path for path in self._pending if path not in current]:
+            del self._pending[path]
+
+        return processed
+
+    def _remember(self, outputs):
+        for path in outputs:
+            self._pending.pop(path, None)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            self._known[path] = (st.st_mtime_ns, st.st_size)
+
+    def _process(self, path):
+        try:
+            if map_input_kind(path) == 'forward':
+                return self._forward(path)
+            return self._reverse(path)
+        except Exception as e:
+            logging.error(f"Failed to convert {path}: {type(e).__name__}: {e}")
+            return []
+
+    def _forward(self, path):
+        base_path = os.path.splitext(path)[0]
+        outputs = output_paths(base_path, self.formats)
+
+        start = time.perf_counter()
+        result = convert(path, outputs, self.size, True, options={'png': {'profile': self.profile}},
+                         skip_unchanged=True)
+        if result.skipped:
+            return []
+        logging.info(f"{path} -> {', '.join(outputs.values())} in {time.perf_counter() - start:.2f}s")
+
+        return list(outputs.values())
+
+    def _reverse(self, path):
+        json_path = str(metadata_path(path))
+        if not os.path.isfile(json_path):
+            logging.warning(f"Skipping {path}: {json_path} not found")
+            return []
+
+        json_data, version_age = load_metadata(json_path)
+        if version_age != "current" and not self.allow_version_mismatch:
+            logging.warning(f"Skipping {path}: metadata written by {json_data['DGCVer']} ({version_age} version)")
+            return []
+
+        output_path = os.path.splitext(path)[0] + ".bin"
+
+        start = time.perf_counter()
+        reverse_converter(path, output_path, json_data)
+        logging.info(f"{path} -> {output_path} in {time.perf_counter() - start:.2f}s")
+
+        return [output_path]
+
+    def run(self, interval=POLL_INTERVAL):
+        logging.info(f"Watching {self.root} for changes (Ctrl+C to stop)")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logging.info("Watch stopped")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="DisplaceBox --watch", description="Reconvert maps when they change")
+    parser.add_argument('path', help="directory to watch")
+    parser.add_argument('--format', type=parse_formats, default=['png'],
+                        help=f"comma-separated output formats ({', '.join(sorted(ENCODERS))})")
+    parser.add_argument('--size', type=int, default=None, help="map side, detected from the .ssl file when omitted")
+    parser.add_argument('--profile', choices=list(PNG_PROFILES), default='fast')
+    parser.add_argument('--allow-version-mismatch', action='store_true',
+                        help="reverse maps whose metadata comes from another DisplaceBox version")
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help="seconds between scans")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help="seconds a file must stay unchanged before it is converted")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if not os.path.isdir(args.path):
+        logging.error(f"{args.path} is not a directory")
+        return 2
+
+    watcher = DirectoryWatcher(args.path, args.format, args.size, args.profile,
+                               args.allow_version_mismatch, args.debounce)
+    watcher.run(args.interval)
+    return 0